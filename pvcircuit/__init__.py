@@ -14,6 +14,7 @@ Based on publications:
 
 This module contains the classes:
     pvc.Junction()   # properties and methods for each junction
+    pvc.JunctionArray()   # parameters of many junctions as arrays for vectorized sweeps
     pvc.IV3T()       # many forms of operational conditions of 3T tandems
     pvc.Tandem3T()   # properties of a 3T tandem including 2 junctions
     pvc.Multi2T()    # properties of a 2T multijunction with arbitrary junctions
@@ -24,6 +25,7 @@ import os
 import importlib
 #
 import pvcircuit.junction as junction
+import pvcircuit.junction_array as junction_array
 import pvcircuit.multi2T as multi2T
 import pvcircuit.iv3T as iv3T
 import pvcircuit.tandem3T as tandem3T
@@ -36,6 +38,8 @@ TK = junction.TK
 Vth = junction.Vth
 Jdb = junction.Jdb
 
+JunctionArray = junction_array.JunctionArray
+
 Multi2T = multi2T.Multi2T
 IV3T = iv3T.IV3T
 Tandem3T = tandem3T.Tandem3T
@@ -61,4 +65,4 @@ __email__ = u'john.geisz@nrel.gov'
 __url__ = u'https://github.nrel.gov/jgeisz/PVcircuit'
 __version__ = VERSION
 __release__ = 'development'
-__all__ = ['junction', 'multi2T', 'iv3T', 'tandem3T', 'qe', 'EY']
+__all__ = ['junction', 'junction_array', 'multi2T', 'iv3T', 'tandem3T', 'qe', 'EY']
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+This is the PVcircuit Package.
+    pvcircuit._aot_build   # ahead-of-time compile _kernels into pvcircuit._kernels_aot
+
+built by setup.py or
+    python -m pvcircuit._aot_build
+rebuild after changing _kernels.py, otherwise the just-in-time _kernels are used
+the just-in-time _kernels are also used when _kernels_aot is not built
+"""
+
+import os
+import sys
+import importlib.util
+from numba.pycc import CC
+
+def _load_kernels():
+    '''
+    pvcircuit._kernels without importing pvcircuit/__init__.py
+    so that setup.py does not need EY, tandems, pandas, etc.
+    '''
+    name = 'pvcircuit._kernels'
+    if name not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_kernels.py')
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+_kernels = _load_kernels()   #numba compiled circuit equations
+KERNELS_HASH = _kernels.source_hash()   # compiled in as a constant
+
+cc = CC('_kernels_aot')
+
+def kernels_hash():
+    return KERNELS_HASH
+
+cc.export('kernels_hash', 'i8()')(kernels_hash)
+
+# same arguments as _kernels, arrays must be C contiguous
+# scalar entry points only: pycc compiles prange as a serial range for a generic cpu,
+# so vdiode_sweep and vdiode_batch stay just-in-time compiled and parallel
+RBB = 'UniTuple(f8,4)'   # rbb_params
+SOLVE = 'f8,f8,f8,f8,i8'   # Vmin, Vmax, xtol, rtol, maxiter
+
+cc.export('jparallel', 'f8(f8,f8,f8,f8,f8[::1],f8[::1],i8,'+RBB+')')(_kernels.jparallel.py_func)
+cc.export('vdiode', 'f8(f8,f8,f8,f8[::1],f8[::1],i8,'+RBB+','+SOLVE+')')(_kernels.vdiode.py_func)
+cc.export('vmid', 'f8(f8,f8,f8,f8,f8,f8[::1],f8[::1],i8,'+RBB+','+SOLVE+')')(_kernels.vmid.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+This is the PVcircuit Package.
+    pvcircuit._kernels   # numba compiled kernels for Junction circuit equations
+"""
+
+import math   #simple math
+import hashlib   #source hash
+import numpy as np   #arrays
+from numba import njit, prange
+
+def source_hash():
+    '''
+    63-bit hash of this file
+    built into _kernels_aot to detect a stale ahead-of-time build
+    '''
+    with open(__file__, 'rb') as f:
+        return int.from_bytes(hashlib.sha256(f.read()).digest()[:8], 'little') >> 1
+
+# integer ids for Junction.RBB_dict['method']
+RBB_IDS = {None:0, 'JFG':1, 'bishop':2}
+
+# fastmath without 'nnan' and 'ninf' because exp() overflows to inf at forward bias
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+@njit(cache=True, fastmath=FASTMATH)
+def jmultidiodes(Vdiode, J0, invVthN):
+    '''
+    recombination current density of parallel diodes
+    J0 masked saturation currents, invVthN = 1/(Vth*n)
+    the common two-diode case is unrolled
+    '''
+    if J0.size == 2:
+        return J0[0] * math.expm1(Vdiode * invVthN[0]) + J0[1] * math.expm1(Vdiode * invVthN[1])
+
+    Jrec = 0.
+    for i in range(J0.size):
+        Jrec += J0[i] * math.expm1(Vdiode * invVthN[i])
+    return Jrec
+
+@njit(cache=True, fastmath=FASTMATH)
+def jshunt_rbb(Vdiode, Vth, Gsh, rbb_id, rbb_params):
+    '''
+    shunt + reverse-bias breakdown current density
+    rbb_id: 0=None, 1=JFG, 2=bishop
+    rbb_params = (Vrb, J0rb, mrb, a)
+    JFG J0rb is prescaled by (Jdb*1000)**(1/mrb)/1000
+    '''
+    Vrb, J0rb, mrb, a = rbb_params
+    JRBB = 0.
+
+    if rbb_id == 1:   # JFG
+        if Vdiode <= Vrb and mrb != 0. :
+            JRBB = -J0rb * math.expm1(-Vdiode / Vth / mrb)
+
+    elif rbb_id == 2:   # bishop
+        if Vdiode <= 0. and Vrb != 0. :
+            base = 1. - Vdiode / Vrb
+            if base > 0.:
+                JRBB = Vdiode * Gsh * a * base**(-mrb)
+            else:   # past breakdown: real part of principal power like python float **
+                JRBB = Vdiode * Gsh * a * (-base)**(-mrb) * math.cos(math.pi * mrb)
+
+    return Vdiode * Gsh + JRBB
+
+@njit(cache=True, fastmath=FASTMATH)
+def jparallel(Vdiode, Jtot, Vth, Gsh, J0, invVthN, rbb_id, rbb_params):
+    '''
+    circuit equation to be zeroed to solve for Vdiode
+    see Junction.Jparallel
+    '''
+    JLED = jmultidiodes(Vdiode, J0, invVthN)
+    if rbb_id == 0:   # shunt only
+        return Jtot - JLED - Vdiode * Gsh
+    JRBB = jshunt_rbb(Vdiode, Vth, Gsh, rbb_id, rbb_params)
+    return Jtot - JLED - JRBB
+
+# residual() modes
+MODE_VDIODE = 0   # zero jparallel(V, Jtot) for Vdiode
+MODE_VMID = 1   # zero Vtot - V + jparallel(V, Jphoto) * Rser for Vmid
+
+@njit(cache=True, fastmath=FASTMATH)
+def residual(V, mode, Vtot, Rser, Jtot, Vth, Gsh, J0, invVthN, rbb_id, rbb_params):
+    '''
+    circuit equation zeroed by brentq_nb
+    see Junction.Jparallel and Junction._dV
+    '''
+    J = jparallel(V, Jtot, Vth, Gsh, J0, invVthN, rbb_id, rbb_params)
+    if mode == MODE_VMID:
+        return Vtot - V + J * Rser
+    return J
+
+@njit(cache=True)
+def brentq_nb(a, b, args, xtol, rtol, maxiter):
+    '''
+    Brent's root finder, same steps as scipy.optimize.brentq
+    zeros residual(x, *args); a global rather than a function argument
+    so that numba can cache it
+    return nan instead of raising for no sign change or no convergence
+    '''
+    xpre = a
+    xcur = b
+    xblk = 0.
+    fblk = 0.
+    spre = 0.
+    scur = 0.
+    fpre = residual(xpre, *args)
+    fcur = residual(xcur, *args)
+    if fpre == 0.:
+        return xpre
+    if fcur == 0.:
+        return xcur
+    if math.copysign(1., fpre) == math.copysign(1., fcur):
+        return math.nan   # root not bracketed
+
+    for i in range(maxiter):
+        if fpre != 0. and fcur != 0. and math.copysign(1., fpre) != math.copysign(1., fcur):
+            xblk = xpre
+            fblk = fpre
+            spre = xcur - xpre
+            scur = spre
+        if abs(fblk) < abs(fcur):
+            xpre = xcur
+            xcur = xblk
+            xblk = xpre
+            fpre = fcur
+            fcur = fblk
+            fblk = fpre
+
+        delta = (xtol + rtol * abs(xcur)) / 2.
+        sbis = (xblk - xcur) / 2.
+        if fcur == 0. or abs(sbis) < delta:
+            return xcur   # converged
+
+        if abs(spre) > delta and abs(fcur) < abs(fpre):
+            if xpre == xblk:   # interpolate
+                stry = -fcur * (xcur - xpre) / (fcur - fpre)
+            else:   # extrapolate
+                dpre = (fpre - fcur) / (xpre - xcur)
+                dblk = (fblk - fcur) / (xblk - xcur)
+                stry = -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre))
+            if 2. * abs(stry) < min(abs(spre), 3. * abs(sbis) - delta):   # good short step
+                spre = scur
+                scur = stry
+            else:   # bisect
+                spre = sbis
+                scur = sbis
+        else:   # bisect
+            spre = sbis
+            scur = sbis
+
+        xpre = xcur
+        fpre = fcur
+        if abs(scur) > delta:
+            xcur += scur
+        elif sbis > 0.:
+            xcur += delta
+        else:
+            xcur -= delta
+        fcur = residual(xcur, *args)
+
+    return math.nan   # did not converge
+
+@njit(cache=True)
+def vdiode(Jtot, Vth, Gsh, J0, invVthN, rbb_id, rbb_params, Vmin, Vmax, xtol, rtol, maxiter):
+    '''
+    solve jparallel(Vdiode, Jtot) = 0 for Vdiode
+    '''
+    args = (MODE_VDIODE, 0., 0., Jtot, Vth, Gsh, J0, invVthN, rbb_id, rbb_params)
+    return brentq_nb(Vmin, Vmax, args, xtol, rtol, maxiter)
+
+@njit(cache=True)
+def vmid(Vtot, Rser, Jphoto, Vth, Gsh, J0, invVthN, rbb_id, rbb_params, Vmin, Vmax, xtol, rtol, maxiter):
+    '''
+    solve Vtot - Vmid + jparallel(Vmid, Jphoto) * Rser = 0 for Vmid
+    '''
+    args = (MODE_VMID, Vtot, Rser, Jphoto, Vth, Gsh, J0, invVthN, rbb_id, rbb_params)
+    return brentq_nb(Vmin, Vmax, args, xtol, rtol, maxiter)
+
+@njit(parallel=True, cache=True)
+def vdiode_sweep(Jdiode, V, Jphoto, Vth, Gsh, J0, invVthN, rbb_id, rbb_params, Vmin, Vmax, xtol, rtol, maxiter):
+    '''
+    vdiode() for each element of 1D float64 Jdiode array into V
+    independent solves run in parallel threads
+    V float32 or float64, Jdiode stays float64 because Jphoto + Jdiode
+    cancels near short circuit
+    return V
+    '''
+    for i in prange(Jdiode.size):
+        V[i] = vdiode(Jphoto + Jdiode[i], Vth, Gsh, J0, invVthN, rbb_id, rbb_params,
+                      Vmin, Vmax, xtol, rtol, maxiter)
+    return V
+
+@njit(parallel=True, cache=True)
+def vdiode_batch(Jdiode, V, Jphoto, Vth, Gsh, J0, invVthN, rbb_id, rbb_params, isdiode,
+                 Vmin, Vmax, xtol, rtol, maxiter):
+    '''
+    vdiode() for each (junction, point) of 2D float64 Jdiode[njuncs, npts] into V
+    junction parameters are columns of a JunctionArray
+    rows of non-diode junctions are left unchanged
+    V float32 or float64, see vdiode_sweep
+    return V
+    '''
+    njuncs, npts = Jdiode.shape
+    for k in prange(njuncs * npts):
+        j = k // npts
+        i = k % npts
+        if isdiode[j]:
+            p = rbb_params[j]
+            V[j, i] = vdiode(Jphoto[j] + Jdiode[j, i], Vth[j], Gsh[j], J0[j], invVthN[j],
+                             rbb_id[j], (p[0], p[1], p[2], p[3]), Vmin, Vmax, xtol, rtol, maxiter)
+    return V
@@ -5,6 +5,7 @@ This is the PVcircuit Package.
 """
 
 import math   #simple math
+import copy
 from time import time
 import numpy as np   #arrays
 import pandas as pd  #data frames
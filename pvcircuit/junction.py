@@ -5,17 +5,24 @@ This is the PVcircuit Package.
 """
 
 import math   #simple math
-import copy
+import warnings   #stale compiled kernels
+from types import MappingProxyType   #read-only RBB_dict
 from time import time
 from functools import lru_cache
 import numpy as np   #arrays
-import matplotlib.pyplot as plt   #plotting
 from parse import *
 from scipy.optimize import brentq    #root finder
-#from scipy.special import lambertw, gammaincc, gamma   #special functions
+from scipy.special import lambertw   #special functions
 import scipy.constants as con   #physical constants
-import ipywidgets as widgets
-from IPython.display import display
+from pvcircuit import _kernels   #numba compiled circuit equations
+try:
+    from pvcircuit import _kernels_aot as _compiled   #ahead-of-time compiled _kernels
+    if _compiled.kernels_hash() != _kernels.source_hash():
+        warnings.warn('pvcircuit._kernels_aot is older than _kernels.py, using just-in-time kernels;'
+                      ' rebuild with "python -m pvcircuit._aot_build"')
+        _compiled = _kernels
+except (ImportError, AttributeError):
+    _compiled = _kernels   #compiled just-in-time
 
 # constants
 k_q = con.k/con.e
@@ -51,6 +58,30 @@ def Jdb(TC, Eg):
     
     #Jdb from Geisz et al.
     return DB_PREFIX * TK(TC)**3. * (EgkT*EgkT + 2.*EgkT + 2.) * np.exp(-EgkT)    #units from DB_PREFIX
+
+def _expm1(x):
+    '''
+    scalar math.expm1 that overflows to inf like np.expm1 instead of raising
+    '''
+    try:
+        return math.expm1(x)
+    except OverflowError:
+        return math.inf
+
+def _lambertw_exp(x):
+    '''
+    principal branch W(exp(x)) without overflow of exp(x) for large x
+    '''
+    if x < 700.:
+        return lambertw(math.exp(x)).real
+
+    w = x - math.log(x)    # asymptotic start, then Newton on w + log(w) = x
+    for i in range(10):
+        dw = w * (x - w - math.log(w)) / (1. + w)
+        w += dw
+        if abs(dw) < EPSREL * w:
+            break
+    return w
         
 class Junction(object):
     """
@@ -62,6 +93,7 @@ class Junction(object):
     ATTR = ['Eg','TC','Gsh','Rser','lightarea','totalarea','Jext','JLC','beta','gamma','pn'
             ,'Jphoto','TK','Jdb']          
     ARY_ATTR = ['n','J0ratio','J0']
+    RECOMPUTE = ['Eg','TC','n','J0ratio','pn','RBB','method','RBB_dict']   # keys that change cached values
     J0scale = 1000. # mA same as Igor, changes J0ratio because of units
 
     def __init__(self, name='junc', Eg=Eg_DEFAULT, TC=TC_REF, \
@@ -71,44 +103,45 @@ class Junction(object):
                  pn=-1, beta=BETA_DEFAUlT, gamma=0. ):
         
         self.ui = None  
-        self.debugout = widgets.Output() # debug output
-        self.RBB_dict = {}
+        self._debugout = None   # debug output created by self.debugout
+        self._RBB_dict = {}   # see self.RBB_dict
 
         # user inputs
         self.name = name    # remember my name
-        self.Eg = np.float64(Eg)  #: [eV] junction band gap
-        self.TC = np.float64(TC)  #: [C] junction temperature
-        self.Jext = np.float64(Jext)   #: [A/cm2] photocurrent density
-        self.Gsh = np.float64(Gsh)  #: [mho] shunt conductance=1/Rsh
-        self.Rser = np.float64(Rser)  #: [ohm] series resistance
-        self.lightarea = np.float64(area)   # [cm2] illuminated junction area
-        self.totalarea = np.float64(area)   # [cm2] total junction area including shaded areas
+        self.Eg = float(Eg)  #: [eV] junction band gap
+        self.TC = float(TC)  #: [C] junction temperature
+        self.Jext = float(Jext)   #: [A/cm2] photocurrent density
+        self.Gsh = float(Gsh)  #: [mho] shunt conductance=1/Rsh
+        self.Rser = float(Rser)  #: [ohm] series resistance
+        self.lightarea = float(area)   # [cm2] illuminated junction area
+        self.totalarea = float(area)   # [cm2] total junction area including shaded areas
         #used for tandems only
         self.pn = int(pn)     # p-on-n=1 or n-on-p=-1
-        self.beta = np.float64(beta)    # LC parameter
-        self.gamma = np.float64(gamma)    # PL parameter from Lan
-        self.JLC = np.float64(JLC)   # LC current from other cell JLC=beta(this)*Jem(other)
+        self.beta = float(beta)    # LC parameter
+        self.gamma = float(gamma)    # PL parameter from Lan
+        self.JLC = float(JLC)   # LC current from other cell JLC=beta(this)*Jem(other)
         
         # multiple diodes
         # n=1 bulk, n=m SNS, and n=2/3 Auger mechanisms
         self.n = np.array(n)   #diode ideality list e.g. [n0, n1]
-        if J0ref == None:
-            self.J0ratio = np.array(J0ratio)    #diode J0/Jdb^(1/n) ratio list for T dependence            
-        else:
-            self._J0init(J0ref)  # calculate self.J0ratio from J0ref at current self.TC
+        self.J0ratio = np.array(J0ratio)    #diode J0/Jdb^(1/n) ratio list for T dependence            
          
-        self.set(RBB=RBB) 
+        self.set(RBB=RBB)   # also calculates cached values
+
+        if J0ref is not None:
+            self._J0init(J0ref)  # calculate self.J0ratio from J0ref at current self.TC
 
     def copy(self):
         '''
         create a copy of a Junction
         need deepcopy() to separate lists, dicts, etc but crashes
         '''
-        tmp = copy.copy(self)
+        tmp = object.__new__(type(self))
+        tmp.__dict__.update(self.__dict__)
         # manual since deepcopy does not work
         tmp.n = self.n.copy()
         tmp.J0ratio = self.J0ratio.copy()
-        tmp.RBB_dict = self.RBB_dict.copy()
+        tmp._RBB_dict = self._RBB_dict.copy()
         return tmp
 
     def __str__(self):
@@ -145,7 +178,7 @@ class Junction(object):
             i+=1
         
         if self.RBB_dict['method'] :
-            strout+=' \nRBB_dict: '+str(self.RBB_dict)
+            strout+=' \nRBB_dict: '+str(self._RBB_dict)
  
         return strout
 
@@ -159,6 +192,19 @@ class Junction(object):
         self.set(key = value)
     '''
     
+    @property
+    def debugout(self):
+        # ipywidgets.Output() for debug messages, created on first use
+        if self._debugout is None:
+            import ipywidgets as widgets
+            self._debugout = widgets.Output()
+        return self._debugout
+
+    def _debug(self, *args):
+        # debug message, only kept once self.debugout has been created
+        if self._debugout is not None:
+            with self._debugout: print(*args)
+
     def update(self):
         # update Junction self.ui controls
 
@@ -184,78 +230,93 @@ class Junction(object):
                 if key in self.ATTR:   # Junction scalar controls to update
                     attrval = getattr(self, key)  # current value of attribute
                     if cval != attrval:
-                        with self.debugout: print('Jupdate: ' + desc, attrval)
+                        self._debug('Jupdate: ' + desc, attrval)
                         cntrl.value = attrval
                 elif key in self.ARY_ATTR:   # Junction array controls to update
                     attrval = getattr(self, key)  # current value of attribute
                     if type(ind) is int:
                         if type(attrval) is np.ndarray:
                             if cval != attrval[ind]:
-                                with self.debugout: print('Jupdate: ' + desc, attrval[ind])
+                                self._debug('Jupdate: ' + desc, attrval[ind])
                                 cntrl.value = attrval[ind]
                 elif key in RBB_keys:
                     attrval = self.RBB_dict[key]
                     if cval != attrval:
-                        with self.debugout: print('Jupdate: ' + desc, attrval)
+                        self._debug('Jupdate: ' + desc, attrval)
                         cntrl.value = attrval  
                                               
+    def _set_rbb(self, key, value, ind):
+        # RBB method shortcut, this change requires redrawing self.ui
+        if value == 'JFG': # RBB shortcut
+            self._RBB_dict =  {'method':'JFG', 'mrb':10., 'J0rb':0.5, 'Vrb':0.}
+        elif value == 'bishop':
+            self._RBB_dict = {'method':'bishop','mrb':3.28, 'avalanche':1., 'Vrb':-5.5}
+        else:
+            self._RBB_dict =  {'method': None}  #no RBB
+
+    def _set_area(self, key, value, ind):
+        # area shortcut
+        self.__dict__['lightarea'] = float(value) 
+        self.__dict__['totalarea'] = float(value) 
+
+    def _set_str(self, key, value, ind):
+        self.__dict__[key] = str(value)
+
+    def _set_int(self, key, value, ind):
+        self.__dict__[key] = int(value)
+
+    def _set_rbb_dict(self, key, value, ind):
+        self._RBB_dict = dict(value)   # set() recomputes, not the self.RBB_dict setter
+
+    def _set_diode(self, key, value, ind):
+        # diode parameters (array)
+        if type(ind) is int and np.isscalar(value) :
+            attrval = getattr(self, key)  # current value of attribute
+            localarray = attrval.copy()
+            if type(localarray) is np.ndarray:
+                if ind < localarray.size:
+                    localarray[ind] = float(value) #add new value
+                    self.__dict__[key] = localarray
+                    self._debug('scalar',key, ind, localarray)
+        else:
+            self.__dict__[key] = np.array(value)
+            self._debug('array', key, value)
+
+    def _set_float(self, key, value, ind):
+        # scalar float
+        self.__dict__[key] = float(value)
+        self._debug('ATTR', key, value)
+
+    # set() handlers by key
+    _SETTERS = dict.fromkeys(ATTR, _set_float)
+    _SETTERS.update({'RBB':_set_rbb, 'method':_set_rbb, 'area':_set_area, 'name':_set_str,
+                     'pn':_set_int, 'RBB_dict':_set_rbb_dict, 'n':_set_diode, 'J0ratio':_set_diode})
+
     def set(self, **kwargs):
         # controlled update of Junction attributes
 
-        with self.debugout: print('Jset('+self.name+'): ', list(kwargs.keys()))
-                        
+        self._debug('Jset('+self.name+'): ', list(kwargs.keys()))
+        recompute = False
         for testkey, value in kwargs.items():
             if testkey.endswith(']') and testkey.find('[') > 0 :
-                key, ind = parse('{}[{:d}]',testkey)   #set one element of array e.g. 'n[0]'
+                #set one element of array e.g. 'n[0]'
+                i = testkey.index('[')
+                key, ind = testkey[:i], int(testkey[i+1:-1])
             else:
                 key = testkey
                 ind = None
 
-            if self.RBB_dict:
-                if self.RBB_dict['method']:
-                    RBB_keys =  list(self.RBB_dict.keys())
-                else:
-                    RBB_keys = []
-                
-            if key == 'RBB' or key == 'method':
-                # this change requires redrawing self.ui
-                if value == 'JFG': # RBB shortcut
-                    self.__dict__['RBB_dict'] =  {'method':'JFG', 'mrb':10., 'J0rb':0.5, 'Vrb':0.}
-                elif value == 'bishop':
-                    self.__dict__['RBB_dict'] = {'method':'bishop','mrb':3.28, 'avalanche':1., 'Vrb':-5.5}
-                else:
-                    self.__dict__['RBB_dict'] =  {'method': None}  #no RBB                     
-                if self.ui:  # junction user interface has been created
-                    #ui = self.controls()    # redraw junction controls 
-                    pass                                   
-            elif key in RBB_keys: #RBB parameters
-                self.RBB_dict[key] = np.float64(value) 
-            elif key == 'area': # area shortcut
-                self.__dict__['lightarea'] = np.float64(value) 
-                self.__dict__['totalarea'] = np.float64(value) 
-            elif key == 'name': # strings
-                self.__dict__[key] = str(value)
-            elif key == 'pn': # integers
-                self.__dict__[key] = int(value)
-            elif key == 'RBB_dict':
-                self.__dict__[key] = value
-            elif key in ['n','J0ratio']: # diode parameters (array)
-                if type(ind) is int and np.isscalar(value) :
-                    attrval = getattr(self, key)  # current value of attribute
-                    localarray = attrval.copy()
-                    if type(localarray) is np.ndarray:
-                        if ind < localarray.size:
-                            localarray[ind] = np.float64(value) #add new value
-                            self.__dict__[key] = localarray
-                            with self.debugout: print('scalar',key, ind, localarray)
-                else:
-                    self.__dict__[key] = np.array(value)
-                    with self.debugout: print('array', key, value)
-            elif key in self.ATTR: # scalar float
-                self.__dict__[key] = np.float64(value)
-                with self.debugout: print('ATTR', key, value)
+            if key in self.RECOMPUTE or key in self.RBB_dict:
+                recompute = True
+
+            if key != 'method' and key in self.RBB_dict and self.RBB_dict['method']:
+                self._RBB_dict[key] = float(value)  #RBB parameters
+            elif key in self._SETTERS:
+                self._SETTERS[key](self, key, value, ind)
             else:
-                with self.debugout: print('no Junckey',key)
+                self._debug('no Junckey',key)
+        if recompute:
+            self._recompute()   # refresh cached values
                 
     @property
     def Jphoto(self): return self.Jext * self.lightarea / self.totalarea + self.JLC 
@@ -270,25 +331,31 @@ class Junction(object):
     @property
     def Vth(self): 
         #Thermal voltage in volts = kT/q
-        return Vth(self.TC)
+        #cached by self._recompute()
+        return self._Vth
 
     @property
     def Jdb(self): 
         #detailed balance saturation current
-        return Jdb(self.TC, self.Eg)
+        #cached by self._recompute()
+        return self._Jdb
     
     @property
     def J0(self):
-        #dynamically calculated J0(T)
+        #J0(T) cached by self._recompute()
         #return np.ndarray [J0(n0), J0(n1), etc]
-    
-        if (type(self.n) is np.ndarray) and (type(self.J0ratio) is np.ndarray):
-            if self.n.size == self.J0ratio.size:
-                return (self.Jdb * self.J0scale)**(1./self.n) * self.J0ratio / self.J0scale 
-            else:
-                return np.nan   # different sizes
-        else:
-           return np.nan    # not numpy.ndarray
+        return self._J0
+
+    @property
+    def RBB_dict(self):
+        #reverse-bias breakdown parameters, read-only view
+        #change with set(Vrb=...) or assign a new dict, both refresh the cached RBB parameters
+        return MappingProxyType(self._RBB_dict)
+
+    @RBB_dict.setter
+    def RBB_dict(self, value):
+        self._RBB_dict = dict(value)   # copy, later edits of value have no effect
+        self._recompute()
        
     def _J0init(self,J0ref):
         '''
@@ -296,22 +363,61 @@ class Junction(object):
         return np.ndarray [J0(n0), J0(n1), etc]
         '''
         J0ref = np.array(J0ref)
-        if (type(self.n) is np.ndarray) and (type(J0ref) is np.ndarray):
-            if self.n.size == J0ref.size:
-                self.J0ratio = self.J0scale * J0ref / (self.Jdb * self.J0scale)**(1./self.n)
-                return 0   # success
-            else:
-                return 1   # different sizes
+        if self.n.size == J0ref.size:
+            logA = np.log(self._Jdb * self.J0scale)
+            self.J0ratio = self.J0scale * J0ref / np.exp(logA / self.n)
+            self._recompute()
+            return 0   # success
         else:
-           return 2    # not numpy.ndarray
+            return 1   # different sizes
     
+    def _recompute(self):
+        '''
+        update cached values after Eg, TC, n, J0ratio, pn, or RBB change
+        Vth, Jdb, J0, diode arrays for vectorized Jmultidiodes,
+        and RBB parameters for the compiled Jparallel
+        diodes with n<=0 or non-finite J0 are masked by zeroing J0
+        '''
+        self._Vth = Vth(self.TC)
+        self._Jdb = Jdb(self.TC, self.Eg)
+
+        # (Jdb*J0scale)**(1/n) as one scalar log and a vector exp
+        if self.n.size == self.J0ratio.size:
+            logA = np.log(self._Jdb * self.J0scale)
+            self._J0 = np.exp(logA / self.n) * self.J0ratio / self.J0scale 
+        else:
+            self._J0 = np.nan   # different sizes
+
+        J0 = np.array(self._J0, dtype=np.float64, ndmin=1)
+        n = np.array(self.n, dtype=np.float64, ndmin=1)
+        if n.size != J0.size:
+            n = np.zeros(0)   # mismatched arrays -> no diodes
+            J0 = np.zeros(0)
+        mask = (n > 0.) & np.isfinite(J0)
+        self._J0rec = np.where(mask, J0, 0.)
+        self._invVthN = np.where(mask, 1. / (self._Vth * np.where(mask, n, 1.)), 0.)
+        self._diodes = list(zip(self._J0rec.tolist(), self._invVthN.tolist()))   # scalar path
+        self._is_diode = bool(self.pn != 0 and np.sum(self._J0) != 0.)   # see notdiode()
+
+        # RBB as (Vrb, J0rb, mrb, a) for _kernels.jshunt_rbb
+        method = self.RBB_dict.get('method')
+        self._rbb_id = _kernels.RBB_IDS.get(method, 0)
+        Vrb = float(self.RBB_dict.get('Vrb', 0.))
+        mrb = float(self.RBB_dict.get('mrb', 0.))
+        if method == 'JFG' and mrb != 0.:
+            J0rb = float(self.RBB_dict['J0rb'] * (self._Jdb*1000)**(1./mrb) / 1000.)
+        else:
+            J0rb = 0.
+        a = float(self.RBB_dict.get('avalanche', 0.))
+        self._rbb_params = (Vrb, J0rb, mrb, a)
+
     def Jem(self,Vmid):
         '''
         light emitted from junction by reciprocity
         quantified as current density
         '''
         if Vmid > 0.:
-            Jem = self.Jdb  * (np.exp(Vmid / self.Vth) - 1.)  # EL Rau
+            Jem = self.Jdb  * _expm1(Vmid / self.Vth)  # EL Rau
             Jem += self.gamma * self.Jphoto   # PL Lan and Green
             return Jem
         else:
@@ -324,14 +430,7 @@ class Junction(object):
         sum(J0) = 0 -> not diode
         pn = 0 -> not diode
         '''
-        if self.pn == 0:
-            return True
-            
-        jsum = np.float64(0.)
-        for saturation_current in self.J0:
-            jsum +=saturation_current
-            
-        return (jsum == np.float64(0.))
+        return not self._is_diode   # cached by self._recompute()
         
     def Jmultidiodes(self,Vdiode):
         '''
@@ -345,17 +444,18 @@ class Junction(object):
         J0 = [1]
         three-diodes
         n = [1, 1.8, (2/3)]
+        Vdiode may be a scalar or numpy.ndarray
         '''     
-        Jrec = np.float64(0.)
-        for ideality_factor, saturation_current in zip(self.n, self.J0):
-            if ideality_factor>0. and math.isfinite(saturation_current):
-                try:
-                    Jrec += saturation_current \
-                        * (np.exp(Vdiode / self.Vth / ideality_factor) - 1.)
-                except:
-                    continue
-     
-        return Jrec        
+        if np.isscalar(Vdiode):   # scalar fast path with math instead of numpy ufuncs
+            Jrec = 0.
+            for J0, invVthN in self._diodes:
+                Jrec += J0 * _expm1(Vdiode * invVthN)
+            return Jrec
+
+        Vdiode = np.asarray(Vdiode, dtype=np.float64)
+        x = Vdiode[..., None] * self._invVthN
+        np.expm1(x, out=x)
+        return x @ self._J0rec   # multiply and sum over diodes in one pass
 
     def JshuntRBB(self, Vdiode):
         '''
@@ -369,33 +469,47 @@ class Junction(object):
     
             RBB_dict={'method':'pvmismatch','ARBD':arbd,'BRBD':brbd,'VRBD':vrb,'NRBD':nrbd:
     
-        Vdiode without Rs
+        Vdiode without Rs, scalar or numpy.ndarray
         Vth = kT
         Gshunt
+        branchless in Vdiode using boolean masks
         '''
          
         RBB_dict = self.RBB_dict
         method=RBB_dict['method']
-        JRBB=np.float64(0.)
+        JRBB=0.
         
         if method=='JFG' :
             Vrb=RBB_dict['Vrb']
             J0rb=RBB_dict['J0rb']
             mrb=RBB_dict['mrb']
-            if Vdiode <= Vrb and mrb != 0. : 
+            if mrb != 0. and np.isscalar(Vdiode):   # math instead of numpy ufuncs
+                if Vdiode <= Vrb:
+                    JRBB = -self._rbb_params[1] * _expm1(-Vdiode / (self.Vth * mrb))   # prescaled J0rb
+            elif mrb != 0. : 
                 #JRBB = -J0rb * (self.Jdb)**(1./mrb) * (np.exp(-Vdiode / self.Vth / mrb) - 1.0)
                 JRBB = -J0rb * (self.Jdb*1000)**(1./mrb) / 1000. \
-                   * (np.exp(-Vdiode / self.Vth / mrb) - 1.0)
+                   * np.expm1(-Vdiode / (self.Vth * mrb)) * (Vdiode <= Vrb)
             
         elif method=='bishop':
             Vrb=RBB_dict['Vrb']
             a=RBB_dict['avalanche']
             mrb=RBB_dict['mrb']
-            if Vdiode <= 0. and Vrb !=0. :  
-                JRBB =  Vdiode * self.Gsh  * a * (1. - Vdiode / Vrb)**(-mrb)
+            if Vrb !=0. and np.isscalar(Vdiode):   # math instead of numpy ufuncs
+                if Vdiode <= 0.:
+                    base = 1. - Vdiode / Vrb
+                    power = abs(base)**(-mrb) if base != 0. else math.inf   # 0.**(-mrb) raises
+                    if base <= 0.:   # past breakdown
+                        power *= math.cos(math.pi * mrb)
+                    JRBB = Vdiode * self.Gsh * a * power
+            elif Vrb !=0. :  
+                base = 1. - np.minimum(Vdiode, 0.) / Vrb
+                # past breakdown (base<0) real part of principal power like python float **
+                power = np.abs(base)**(-mrb) * np.where(base > 0., 1., np.cos(np.pi * mrb))
+                JRBB =  Vdiode * self.Gsh  * a * power * (Vdiode <= 0.)
                  
         elif method=='pvmismatch':
-            JRBB=np.float64(0.) 
+            JRBB=0.
             
     
         return Vdiode * self.Gsh + JRBB
@@ -409,10 +523,11 @@ class Junction(object):
         if self.notdiode():  # sum(J0)=0 -> no diode
             return Jtot
 
-        JLED = self.Jmultidiodes(Vdiode)
-        JRBB = self.JshuntRBB(Vdiode)
-        #JRBB = JshuntRBB(Vdiode, self.Vth, self.Gsh, self.RBB_dict)
-        return Jtot - JLED  - JRBB
+        if not (np.isscalar(Vdiode) and np.isscalar(Jtot)):   # numpy arrays
+            return Jtot - self.Jmultidiodes(Vdiode) - self.JshuntRBB(Vdiode)
+
+        return _compiled.jparallel(float(Vdiode), float(Jtot), float(self.Vth), float(self.Gsh),
+                                  self._J0rec, self._invVthN, self._rbb_id, self._rbb_params)
 
     def Vdiode(self,Jdiode):
         '''
@@ -427,15 +542,64 @@ class Junction(object):
 
         Jtot = self.Jphoto + Jdiode
         
-        try: 
-            Vdiode = brentq(self.Jparallel, -VLIM_REVERSE, VLIM_FORWARD, args=(Jtot),
-                           xtol=VTOL, rtol=EPSREL, maxiter=MAXITER,
-                           full_output=False, disp=True)
-        except:
-            return np.nan
-            #print("Exception:",err)
-                    
-        return Vdiode
+        # compiled brentq, returns nan if it fails
+        return _compiled.vdiode(float(Jtot), float(self.Vth), float(self.Gsh),
+                               self._J0rec, self._invVthN, self._rbb_id, self._rbb_params,
+                               -VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL, MAXITER)
+
+    def Voc_analytic(self):
+        '''
+        open-circuit Vdiode(0) from the closed-form Lambert W solution
+        of a single diode with shunt and no RBB (Jain and Kapoor)
+        otherwise falls back to brentq Vdiode(0)
+        nan like Vdiode(0) if there is no solution within -VLIM_REVERSE..VLIM_FORWARD
+        '''
+
+        if self.notdiode():  # sum(J0)=0 -> no diode
+            return 0.
+
+        if self.n.size != 1 or self._rbb_id != 0 or self._J0rec[0] == 0.:
+            return self.Vdiode(0.)
+
+        nVth = 1. / self._invVthN[0]
+        J0 = self._J0rec[0]
+        Jphoto = self.Jphoto
+        if self.Gsh == 0.:
+            if Jphoto / J0 <= -1.:   # no solution
+                return nan
+            Voc = nVth * math.log1p(Jphoto / J0)
+        else:
+            # Jphoto + J0 - Gsh*V = J0*exp(V/nVth)
+            x = (Jphoto + J0) / (self.Gsh * nVth)
+            Voc = (Jphoto + J0) / self.Gsh - nVth * _lambertw_exp(x + math.log(J0 / (self.Gsh * nVth)))
+
+        if not -VLIM_REVERSE <= Voc <= VLIM_FORWARD:   # nan outside the range of Vdiode(0)
+            return nan
+        return Voc
+
+    def Vdiode_array(self,Jdiode,dtype=np.float64):
+        '''
+        Vdiode(Jdiode) for each element of an array of Jdiode
+        solved in parallel by compiled brentq
+        dtype of the returned V, np.float32 halves its memory
+        Jdiode and each solve stay float64 because Jphoto + Jdiode cancels near short circuit
+        return numpy.ndarray same shape as Jdiode
+        '''
+
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError('dtype must be float32 or float64')
+
+        Jdiode = np.asarray(Jdiode, dtype=np.float64)
+        if self.notdiode():  # sum(J0)=0 -> no diode
+            return np.zeros(Jdiode.shape, dtype=dtype)
+
+        V = np.empty(Jdiode.size, dtype=dtype)
+        # just-in-time kernel, the ahead-of-time build is not parallel
+        V = _kernels.vdiode_sweep(np.ascontiguousarray(Jdiode.ravel()), V, float(self.Jphoto), float(self.Vth), float(self.Gsh),
+                                  self._J0rec, self._invVthN, self._rbb_id, self._rbb_params,
+                                  -VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL, MAXITER)
+        return V.reshape(Jdiode.shape)
 
     def _dV(self, Vmid, Vtot):
         '''
@@ -458,21 +622,16 @@ class Junction(object):
         if self.notdiode():  # sum(J0)=0 -> no diode
             return 0.
  
-        try:        
-            Vmid = brentq(self._dV, -VLIM_REVERSE, VLIM_FORWARD, args=(Vtot),
-                           xtol=VTOL, rtol=EPSREL, maxiter=MAXITER,
-                           full_output=False, disp=True)
-           
-        except:
-            return np.nan
-            #print("Exception:",err)
-      
-        return Vmid 
+        # compiled brentq of self._dV, returns nan if it fails
+        return _compiled.vmid(float(Vtot), float(self.Rser), float(self.Jphoto), float(self.Vth),
+                             float(self.Gsh), self._J0rec, self._invVthN, self._rbb_id,
+                             self._rbb_params, -VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL, MAXITER)
  
     def controls(self):
         '''
         use interactive_output for GUI in IPython
         '''
+        import ipywidgets as widgets   # only needed for GUI
         
         cell_layout = widgets.Layout(display='inline_flex',
                             flex_flow='row',
@@ -522,9 +681,9 @@ class Junction(object):
             desc = owner.description            
               
             if new == old:
-                with self.debugout: print('Jcontrol: ' + desc + '=', value)
+                self._debug('Jcontrol: ' + desc + '=', value)
             else:
-                with self.debugout: print('Jcontrol: ' + desc + '->', value)
+                self._debug('Jcontrol: ' + desc + '->', value)
                 self.set(**{desc:value})
                 
             #iout.clear_output()
@@ -562,7 +721,7 @@ class Junction(object):
             cntrls.append(in_rbblab) 
             in_rbb = []  # empty list of n controls
             for i, key in enumerate(RBB_keys):
-                with self.debugout: print('RBB:',i,key)
+                self._debug('RBB:',i,key)
                 if key == 'method':       
                     in_rbb.append(widgets.Dropdown(options=['','JFG','bishop'],value=self.RBB_dict[key],
                         description=key, layout=cell_layout, continuous_update=False))
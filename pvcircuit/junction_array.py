@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+This is the PVcircuit Package. 
+    pvcircuit.JunctionArray()   # parameters of many junctions as arrays for vectorized sweeps
+"""
+
+import numpy as np   #arrays
+from pvcircuit import _kernels   #numba compiled circuit equations
+from pvcircuit.junction import VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL, MAXITER
+
+class JunctionArray(object):
+    '''
+    struct-of-arrays snapshot of a list of Junction objects
+    each parameter is a column with one row per junction
+    diode arrays are padded to the largest number of diodes
+    padded diodes have J0 = 0 and n, J0ratio = nan
+    dtype of bulk V arrays, np.float32 halves memory of large sweeps
+    Jdiode, junction parameters and each solve stay float64
+    (Jphoto + Jdiode cancels near short circuit and J0 underflows float32)
+    '''
+
+    ATTR = ['Eg','TC','Gsh','Rser','Jphoto','Vth','Jdb','pn']   # 1D columns [njuncs]
+    ARY_ATTR = ['n','J0ratio','J0']   # 2D columns [njuncs, ndiodes]
+
+    def __init__(self, juncs, name='JunctionArray', dtype=np.float64):
+
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError('dtype must be float32 or float64')
+        self.names = [junc.name for junc in juncs]
+        self.njuncs = len(juncs)
+        ndiodes = max([junc._J0rec.size for junc in juncs] + [0])
+
+        for key in self.ATTR:
+            setattr(self, key, np.array([getattr(junc, key) for junc in juncs], dtype=np.float64))
+
+        self.n = np.full((self.njuncs, ndiodes), np.nan)
+        self.J0ratio = np.full((self.njuncs, ndiodes), np.nan)
+        self.J0 = np.zeros((self.njuncs, ndiodes))   # masked like Junction._J0rec
+        self._invVthN = np.zeros((self.njuncs, ndiodes))
+        self._rbb_id = np.zeros(self.njuncs, dtype=np.int64)
+        self._rbb_params = np.zeros((self.njuncs, 4))
+        self._is_diode = np.zeros(self.njuncs, dtype=np.bool_)
+
+        for i, junc in enumerate(juncs):
+            size = junc._J0rec.size
+            self.n[i, :size] = junc.n[:size]
+            self.J0ratio[i, :size] = junc.J0ratio[:size]
+            self.J0[i, :size] = junc._J0rec
+            self._invVthN[i, :size] = junc._invVthN
+            self._rbb_id[i] = junc._rbb_id
+            self._rbb_params[i] = junc._rbb_params
+            self._is_diode[i] = junc._is_diode
+
+    @classmethod
+    def from_list(cls, juncs, name='JunctionArray', dtype=np.float64):
+        '''
+        stack the parameters of a list of Junction objects
+        '''
+        return cls(juncs, name=name, dtype=dtype)
+
+    def __str__(self):
+        strout = self.name+": <pvcircuit.junction_array.JunctionArray class>"
+        strout += '\n{0:d} junctions: '.format(self.njuncs) + ', '.join(self.names)
+        return strout
+
+    def __repr__(self):
+        return str(self)
+
+    def Jmultidiodes_batch(self, Vdiode):
+        '''
+        recombination current density of every junction
+        at each voltage of 1D Vdiode
+        return np.ndarray [njuncs, len(Vdiode)]
+        '''
+        Vdiode = np.asarray(Vdiode, dtype=np.float64).ravel()
+        x = Vdiode[None,:,None] * self._invVthN[:,None,:]   # [njuncs, npts, ndiodes]
+        np.expm1(x, out=x)
+        return np.matmul(x, self.J0[:,:,None])[:,:,0]   # multiply and sum over diodes in one pass
+
+    def Vdiode(self, Jdiode):
+        '''
+        Junction.Vdiode() for each junction and operating point
+        Jdiode 2D [njuncs, npts] or 1D [npts] used for every junction
+        solved in parallel by compiled brentq
+        return np.ndarray [njuncs, npts] of self.dtype
+        '''
+        Jdiode = np.asarray(Jdiode, dtype=np.float64)
+        if Jdiode.ndim < 2:
+            Jdiode = np.broadcast_to(Jdiode.ravel(), (self.njuncs, Jdiode.size))
+        if Jdiode.ndim != 2 or Jdiode.shape[0] != self.njuncs:   # compiled kernel does not bounds-check
+            raise ValueError('Jdiode must be [npts] or [njuncs={0:d}, npts], not {1}'
+                             .format(self.njuncs, Jdiode.shape))
+        Jdiode = np.ascontiguousarray(Jdiode)
+
+        # just-in-time kernel, the ahead-of-time build is not parallel
+        V = np.zeros(Jdiode.shape, dtype=self.dtype)   # non-diode junctions stay 0
+        return _kernels.vdiode_batch(Jdiode, V, self.Jphoto, self.Vth, self.Gsh, self.J0,
+                                     self._invVthN, self._rbb_id, self._rbb_params, self._is_diode,
+                                     -VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL, MAXITER)
@@ -1,5 +1,23 @@
+import os
+import importlib.util
 from setuptools import setup, find_packages
 
+ext_modules = []
+
+# optional ahead-of-time compiled numba kernels, see pvcircuit/_aot_build.py
+# loaded by path because importing pvcircuit needs all of its dependencies
+# without numba or a C compiler the just-in-time kernels are used instead
+try:
+    spec = importlib.util.spec_from_file_location('pvcircuit._aot_build',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pvcircuit', '_aot_build.py'))
+    aot_build = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(aot_build)
+    aot_ext = aot_build.cc.distutils_extension()
+    aot_ext.optional = True   # failed builds do not fail the install
+    ext_modules.append(aot_ext)
+except (ImportError, RuntimeError):   # RuntimeError: numba finds no C compiler
+    pass
+
 # Setting up
 setup(
         name="PVcircuit", 
@@ -11,10 +29,12 @@ setup(
         url='https://github.com/NREL/PVcircuit',
         license='LICENSE.txt',
         packages=find_packages(),
+        ext_modules=ext_modules,
         install_requires=['numpy>=1.13.3', 
                           'matplotlib>=2.1.0', 
                           'parse>=1.19.0',
                           'scipy>=1.0.0',
+                          'numba>=0.50',
                           'ipywidgets>=7.6.5',
                           'ipympl>=0.7.0',
                           'pandas>=1.0',
@@ -0,0 +1,121 @@
+# # Junction circuit equations and solvers
+import numpy as np
+import pytest
+import pvcircuit as pvc
+
+JFG_DICT = {'method':'JFG', 'mrb':43., 'J0rb':0.3, 'Vrb':0.}
+
+def junc_4J():
+    # bottom junction of MM927 in test_4JIMM.py
+    return pvc.Junction(Eg=0.743, n=[1,1.5], J0ratio=[173,79], Jext=0.01228, beta=10.5)
+
+# %%
+def test_RBB_dict_assignment():
+    # direct assignment like test_4JIMM.py refreshes the cached RBB parameters
+    junc = junc_4J()
+    junc.RBB_dict = dict(JFG_DICT)
+    ref = junc_4J()
+    ref.set(RBB_dict=dict(JFG_DICT))
+
+    V = junc.Vdiode(-0.05)
+    assert np.isclose(V, -5.77125892050624, rtol=1e-5)
+    assert np.isclose(V, ref.Vdiode(-0.05), rtol=1e-12)
+
+    junc.RBB_dict = {'method':None}
+    assert np.isclose(junc.Vdiode(0.), junc_4J().Vdiode(0.), rtol=1e-12)
+
+def test_RBB_dict_readonly():
+    # in-place edits would bypass the cached RBB parameters, set() refreshes them
+    junc = junc_4J()
+    junc.RBB_dict = dict(JFG_DICT)
+    with pytest.raises(TypeError):
+        junc.RBB_dict['Vrb'] = -3.
+    junc.set(mrb=30.)
+    V = junc.Vdiode(-0.05)   # compiled path agrees with the numpy path
+    assert np.isclose(junc.Jparallel(np.array([V]), junc.Jphoto - 0.05)[0], 0., atol=1e-6)
+    assert not np.isclose(V, -5.77125892050624, rtol=1e-3)
+
+def test_Jparallel_array():
+    # numpy arrays give the same residual as the compiled scalar path
+    Vs = np.linspace(-8., 0.6, 25)
+    for RBB in [None, 'JFG', 'bishop']:
+        junc = pvc.Junction(RBB=RBB, Gsh=1e-3)
+        Jarr = junc.Jparallel(Vs, 0.01)
+        assert isinstance(Jarr, np.ndarray) and Jarr.shape == Vs.shape
+        assert np.allclose(Jarr, [junc.Jparallel(V, 0.01) for V in Vs], rtol=1e-12, atol=1e-15)
+
+# %%
+def juncs_RBB():
+    # one junction for each RBB method, with and without shunt
+    juncs = []
+    for RBB in [None, 'JFG', 'bishop']:
+        for Gsh in [0., 1e-3]:
+            juncs.append(pvc.Junction(name=str(RBB), RBB=RBB, Gsh=Gsh, Rser=0.5, Eg=1.4, Jext=0.02))
+    juncs.append(pvc.Junction(name='3 diodes', n=[1, 1.8, 0.7], J0ratio=[10, 5, 2], Jext=0.03))
+    return juncs
+
+def test_brentq_nb():
+    # compiled brentq agrees with scipy.optimize.brentq of the python circuit equation
+    from scipy.optimize import brentq
+    from pvcircuit.junction import VLIM_REVERSE, VLIM_FORWARD, VTOL, EPSREL
+
+    def root(f):
+        # scipy raises where the compiled brentq returns nan
+        try:
+            return brentq(f, -VLIM_REVERSE, VLIM_FORWARD, xtol=VTOL, rtol=EPSREL)
+        except ValueError:
+            return np.nan
+
+    for junc in juncs_RBB():
+        def Jpy(V, Jtot):
+            return Jtot - junc.Jmultidiodes(V) - junc.JshuntRBB(V)
+        for Jdiode in [-0.05, -0.021, 0., 0.01, 1.]:
+            Vref = root(lambda V: Jpy(V, junc.Jphoto + Jdiode))
+            assert np.isclose(junc.Vdiode(Jdiode), Vref, rtol=0., atol=VTOL, equal_nan=True), \
+                (junc.name, Jdiode)
+        for Vtot in [-8., -1., 0.5, 1.2]:
+            Vref = root(lambda V: Vtot - V + Jpy(V, junc.Jphoto) * junc.Rser)
+            assert np.isclose(junc.Vmid(Vtot), Vref, rtol=0., atol=VTOL, equal_nan=True), (junc.name, Vtot)
+
+def test_Vdiode_array():
+    # parallel sweeps agree with scalar Vdiode
+    Jdiode = np.linspace(-0.05, 0.05, 21)
+    juncs = juncs_RBB()
+    Vscalar = np.array([[junc.Vdiode(J) for J in Jdiode] for junc in juncs])
+    for junc, V in zip(juncs, Vscalar):
+        assert np.allclose(junc.Vdiode_array(Jdiode), V, rtol=1e-10, atol=0., equal_nan=True)
+        assert junc.Vdiode_array(Jdiode.reshape(3, 7)).shape == (3, 7)
+    A = pvc.JunctionArray(juncs)
+    assert np.allclose(A.Vdiode(Jdiode), Vscalar, rtol=1e-10, atol=0., equal_nan=True)
+
+def test_Voc_analytic():
+    # Lambert W open circuit agrees with brentq Vdiode(0)
+    from pvcircuit.junction import VTOL
+    for Gsh in [0., 1e-6, 1e-3, 1.]:
+        for Jext in [0., 0.01, 0.04, -0.01]:
+            junc = pvc.Junction(n=[1.], J0ratio=[10.], Gsh=Gsh, Jext=Jext)
+            assert np.isclose(junc.Voc_analytic(), junc.Vdiode(0.), rtol=0., atol=VTOL,
+                              equal_nan=True), (Gsh, Jext)
+
+def test_JunctionArray_shape():
+    # one row of Jdiode per junction
+    A = pvc.JunctionArray([pvc.Junction(), pvc.Junction(RBB='JFG')])
+    assert A.Vdiode(np.zeros((2, 3))).shape == (2, 3)
+    with pytest.raises(ValueError):
+        A.Vdiode(np.zeros((6, 3)))
+
+def test_float32_V():
+    # float32 V agrees with float64 through short circuit Jdiode = -Jphoto
+    Jdiode = np.linspace(-0.1, 0.1, 11)
+    juncs = juncs_RBB()
+    for junc in juncs:
+        junc.set(Jext=0.04)
+        V64 = junc.Vdiode_array(Jdiode)
+        V32 = junc.Vdiode_array(Jdiode, dtype=np.float32)
+        assert V32.dtype == np.float32
+        assert np.allclose(V32, V64, rtol=1e-6, atol=1e-6, equal_nan=True), junc.name
+    A32 = pvc.JunctionArray(juncs, dtype=np.float32)
+    V32 = A32.Vdiode(Jdiode)
+    assert V32.dtype == np.float32
+    assert np.allclose(V32, pvc.JunctionArray(juncs).Vdiode(Jdiode), rtol=1e-6, atol=1e-6,
+                       equal_nan=True)